@@ -6,23 +6,150 @@ This module provides functions to calculate five similarity measures: Overlap
 coefficient, Jaccard similarity, Dice-Sørensen coefficient, Cosine similarity,
 simple matching coefficient, and Hamming coefficient. Input validation ensures that the provided
 sets meet the required criteria for each calculation.
+
+For frozenset inputs the coefficients can cache their results, see
+enable_cache; the cache is off by default.
 """
 
 # Standard library
+import collections
 import functools
+import heapq
 import math
 import numbers
 import typing
 import warnings
 
 
-def validate_input(option: typing.Optional[str] = None) -> typing.Callable:
+# Integer elements smaller than this factor times the number of distinct
+# elements are used as bit positions directly by to_bitsets
+_DENSE_FACTOR: int = 8
+# Types accepted as sets by the validator
+_SET_TYPES: tuple[type, ...] = (set, frozenset)
+# Common numeric types that can be classified without the numbers.Number ABC
+_NUM_TYPES: tuple[type, ...] = (int, float, complex)
+
+
+@functools.lru_cache(maxsize=None)
+def _element_type(type_: type) -> type:
+    """
+    Classify the type of a set element for the homogeneity check.
+
+    The result is cached per type, so the numbers.Number ABC lookup is only
+    done once for every type that is encountered.
+
+    Parameters:
+    type_: The type of the element.
+
+    Returns:
+    type: numbers.Number for numeric types, otherwise the type itself.
+    """
+    return numbers.Number if issubclass(type_, numbers.Number) else type_
+
+
+def _validate_sets(sets: typing.Iterable, on_empty: str = "zero") -> None:
+    """
+    Validate a collection of sets for the batched calculations.
+
+    Every set is checked once, instead of once for every pair it is part of.
+    Empty sets are reported at most once per batch, so a matrix with many
+    empty pairs does not go through the warnings machinery for every pair.
+
+    Parameters:
+    sets: The sets to validate.
+    on_empty: What to do if any set is empty: "zero" to silently score its
+    undefined pairs as 0, "warn" to do so with a single warning or "raise",
+    default is "zero".
+
+    Raises:
+    ValueError: If on_empty is incorrect, or if a set is empty and on_empty
+                is "raise".
+    TypeError: If any argument is not a set or if elements are of
+               different types.
+    """
+    if on_empty not in ("zero", "warn", "raise"):
+        raise ValueError("The provided on_empty is incorrect; it can only be "
+                         "'zero', 'warn' or 'raise'")
+    element_types: set = set()
+    has_empty: bool = False
+    for s in sets:
+        if type(s) not in _SET_TYPES:
+            raise TypeError("All arguments must be sets!")
+        if s:
+            element_types.add(_element_type(type(next(iter(s)))))
+        else:
+            has_empty = True
+    if len(element_types) > 1:
+        raise TypeError("Elements in the sets must be of the same type.")
+    if has_empty and on_empty == "warn":
+        warnings.warn("At least one of the sets is empty!", UserWarning)
+    elif has_empty and on_empty == "raise":
+        raise ValueError("At least one of the sets is empty!")
+
+
+# Whether the coefficients cache their results for frozenset inputs
+_use_cache: bool = False
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_call(func: typing.Callable, *args: frozenset) -> typing.Any:
+    """
+    Call a similarity function, caching the result per function and inputs.
+
+    Only frozensets are passed in, as they cannot change between calls.
+
+    Parameters:
+    func: The similarity function to call.
+    args: The validated frozensets to call it with.
+
+    Returns:
+    The result of the similarity function.
+    """
+    return func(*args)
+
+
+def clear_cache() -> None:
+    """
+    Clear the cached results of similarity calls on frozensets.
+    """
+    _cached_call.cache_clear()
+
+
+def enable_cache(enabled: bool = True) -> None:
+    """
+    Turn the result cache of the coefficients for frozenset inputs on or off.
+
+    The cache holds strong references to the arguments of up to 1024 calls,
+    so the frozensets stay in memory until they are evicted or clear_cache is
+    called. Turning the cache off also clears it.
+
+    Parameters:
+    enabled: Whether to cache the results, default is True.
+    """
+    global _use_cache
+    _use_cache = enabled
+    if not enabled:
+        clear_cache()
+
+
+@functools.lru_cache(maxsize=4)
+def validate_input(option: typing.Optional[str] = None,
+                   cache: bool = False) -> typing.Callable:
     """
     Decorator to validate input sets for the decorated function.
 
+    Frozensets are accepted as well. As they cannot be mutated, the result for
+    frozenset inputs can be cached once enable_cache is called; use
+    clear_cache to empty that cache. The decorator itself is cached per
+    option, so repeated calls with the same option return the same
+    decorator.
+
     Parameters:
     option: Optional parameter to specify validation rules. If "one", at least
             one set must be non-empty.
+    cache: Whether the results for frozenset inputs may be cached when the
+           cache is enabled, default is False. Only suitable for pure
+           functions.
 
     Raises:
     ValueError: If option is provided and is not "one".
@@ -33,6 +160,8 @@ def validate_input(option: typing.Optional[str] = None) -> typing.Callable:
     if option and option != "one":
         raise ValueError(
             "The provided option is incorrect; it can only be 'one'")
+    # Resolve the option once, at decoration time, instead of on every call
+    need_both: bool = option == "one"
 
     def decorator_validate_input(func: typing.Callable) -> typing.Callable:
         """
@@ -46,14 +175,18 @@ def validate_input(option: typing.Optional[str] = None) -> typing.Callable:
         """
         # Preserves the metadata of the original function, such as name.
         @functools.wraps(func)
-        def wrapper_validate_input(*args: tuple[typing.Set]) -> typing.Any:
+        def wrapper_validate_input(set1: set,
+                                   set2: set,
+                                   total_range: typing.Optional[set] = None,
+                                   /) -> typing.Any:
             """
             Wrapper function that performs input validation before calling the
             function.
 
             Parameters:
-            args: Variable length argument list representing the sets to be
-                  validated.
+            set1: The first set.
+            set2: The second set.
+            total_range: The entire set of all options, default is None.
 
             Raises:
             TypeError: If any argument is not a set or if elements are of
@@ -64,35 +197,56 @@ def validate_input(option: typing.Optional[str] = None) -> typing.Callable:
             both sets are empty.
             """
             # Validate that all arguments are sets
-            if not all(isinstance(s, set) for s in args):
+            if (type(set1) not in _SET_TYPES
+                    or type(set2) not in _SET_TYPES
+                    or (total_range is not None
+                        and type(total_range) not in _SET_TYPES)):
                 raise TypeError("All arguments must be sets!")
             # Ensure at least one set is non-empty if option is "one"
-            if option == "one" and any(not s for s in args[:2]):
+            if need_both and (not set1 or not set2):
                 warnings.warn("At least one of the sets must be non-empty.")
                 return None
             # Return 0 if all sets are empty
-            if all(not s for s in args[:2]):
+            if not set1 and not set2:
                 warnings.warn("Both sets are empty!", UserWarning)
                 return 0
-            # Ensure all elements in the sets are of the same type
-            if len({numbers.Number if isinstance(c, numbers.Number)
-                    else type(c) for c in args[0] | args[1]}) != 1:
-                raise TypeError(
-                    "Elements in the sets must be of the same type.")
+            # Ensure all elements in the sets are of the same type, sampling
+            # one element per set to keep the check independent of set size
+            if set1 and set2:
+                type1: type = type(next(iter(set1)))
+                type2: type = type(next(iter(set2)))
+                # Only differing types need to be classified, as all numeric
+                # types count as the same type
+                if type1 is not type2 and (
+                        (numbers.Number if type1 in _NUM_TYPES
+                         else _element_type(type1))
+                        is not (numbers.Number if type2 in _NUM_TYPES
+                                else _element_type(type2))):
+                    raise TypeError(
+                        "Elements in the sets must be of the same type.")
             # Ensure that the provided totalrange is a superset of the other
-            # two sets, otherwise remove it from the arguments
-            if len(args) == 3:
-                set1, set2, total_range = args
-                if not total_range >= (set1 | set2):
-                    warnings.warn("The total range provided is not a superset of the other two sets",  # noqa E501
-                                  UserWarning)
-                    args = args[:2]
-            return func(*args)
+            # two sets, otherwise leave it out
+            if total_range is not None and not (set1 <= total_range
+                                                and set2 <= total_range):
+                warnings.warn("The total range provided is not a superset of the other two sets",  # noqa E501
+                              UserWarning)
+                total_range = None
+            if total_range is None:
+                # Immutable inputs can be looked up in the result cache
+                if (cache and _use_cache and type(set1) is frozenset
+                        and type(set2) is frozenset):
+                    return _cached_call(func, set1, set2)
+                return func(set1, set2)
+            if (cache and _use_cache and type(set1) is frozenset
+                    and type(set2) is frozenset
+                    and type(total_range) is frozenset):
+                return _cached_call(func, set1, set2, total_range)
+            return func(set1, set2, total_range)
         return wrapper_validate_input
     return decorator_validate_input
 
 
-@validate_input("one")
+@validate_input("one", cache=True)
 def overlap_coefficient(set1: set,
                         set2: set,
                         total_range: typing.Optional[set] = None,
@@ -111,10 +265,15 @@ def overlap_coefficient(set1: set,
     Returns:
     float: The overlap coefficient between the two sets.
     """
+    # Identical and disjoint sets need no intersection to be built
+    if set1 is set2:
+        return 1.0
+    if set1.isdisjoint(set2):
+        return 0.0
     return len(set1 & set2) / min(len(set1), len(set2))
 
 
-@validate_input()
+@validate_input(cache=True)
 def jaccard_similarity(set1: set,
                        set2: set,
                        total_range: typing.Optional[set] = None,
@@ -133,10 +292,17 @@ def jaccard_similarity(set1: set,
     Returns:
     float: The Jaccard coefficient between the two sets.
     """
-    return len(set1 & set2) / len(set1 | set2)
+    # Identical and disjoint sets need no intersection to be built
+    if set1 is set2:
+        return 1.0
+    if set1.isdisjoint(set2):
+        return 0.0
+    # The union size follows from the intersection, so only one set is built
+    intersection: int = len(set1 & set2)
+    return intersection / (len(set1) + len(set2) - intersection)
 
 
-@validate_input()
+@validate_input(cache=True)
 def dice_sørensen_coefficient(set1: set,
                               set2: set,
                               total_range: typing.Optional[set] = None,
@@ -155,10 +321,15 @@ def dice_sørensen_coefficient(set1: set,
     Returns:
     float: The Dice-Sørensen coefficient between the two sets.
     """
+    # Identical and disjoint sets need no intersection to be built
+    if set1 is set2:
+        return 1.0
+    if set1.isdisjoint(set2):
+        return 0.0
     return 2 * len(set1 & set2) / (len(set1) + len(set2))
 
 
-@validate_input("one")
+@validate_input("one", cache=True)
 def cosine_similarity(set1: set,
                       set2: set,
                       total_range: typing.Optional[set] = None,
@@ -167,6 +338,8 @@ def cosine_similarity(set1: set,
 
     Formula:
     |set1 . set2| / (||set1|| x ||set2||)
+    which for binary vectors reduces to
+    |set1 ∩ set2| / sqrt(|set1| x |set2|)
 
     Parameters:
     set1: The first set.
@@ -177,17 +350,23 @@ def cosine_similarity(set1: set,
     Returns:
     float: The cosine coefficient between the two sets.
     """
-    intersection: set = set1 | set2
-    vector1: list[int] = [1 if i in set1 else 0 for i in intersection]
-    vector2: list[int] = [1 if i in set2 else 0 for i in intersection]
-    dot_product: int = sum(a * b for a, b in zip(vector1, vector2))
-    norm_a: float = math.sqrt(sum(a ** 2 for a in vector1))
-    norm_b: float = math.sqrt(sum(b ** 2 for b in vector2))
-    magnitude: float = norm_a * norm_b
-    return dot_product / magnitude
+    # Identical and disjoint sets need no intersection to be built
+    if set1 is set2:
+        return 1.0
+    if set1.isdisjoint(set2):
+        return 0.0
+    # The dot product of two binary vectors is the size of the intersection
+    # and the norm of a binary vector is the root of the size of the set
+    dot_product: int = len(set1 & set2)
+    size1: int = len(set1)
+    size2: int = len(set2)
+    # Equal sets are fully similar, no square root needed
+    if dot_product == size1 == size2:
+        return 1.0
+    return dot_product / math.sqrt(size1 * size2)
 
 
-@validate_input("one")
+@validate_input("one", cache=True)
 def simple_matching_coefficient(set1: set,
                                 set2: set,
                                 total_range: typing.Optional[set] = None,
@@ -209,21 +388,30 @@ def simple_matching_coefficient(set1: set,
     Returns:
     float: The simple matching coefficient between the two sets.
     """
-    all_: set = set1 | set2 if not total_range else total_range
+    # Identical sets agree on every position
+    if set1 is set2:
+        return 1.0
     p: int = len(set1 & set2)
-    q: int = len(set1 - set2)
-    r: int = len(set2 - set1)
-    s: int = len((set1 ^ all_) & (set2 ^ all_))
+    # The one-sided counts follow from the set sizes, no differences needed
+    q: int = len(set1) - p
+    r: int = len(set2) - p
+    # The total range is a superset of both sets, so the elements absent from
+    # both are those outside the union; without a total range the union is
+    # the universe and nothing is absent from both sets
+    s: int = len(total_range) - (p + q + r) if total_range else 0
     return (p + s) / (p + q + r + s)
 
 
+@functools.singledispatch
 def hamming_distance(set1: set, set2: set) -> int:
     """
     Calculate the Hamming distance between two sets.
 
     The Hamming distance is defined as the number of elements that are 
-    present in either of the sets but not in both. This function uses 
-    the symmetric difference operator to compute the distance.
+    present in either of the sets but not in both. This function derives it
+    from the set sizes and the size of the intersection, which is smaller
+    than the symmetric difference. Bitsets, as returned by to_bitsets, are
+    dispatched to hamming_bits.
 
     Parameters:
     set1 : The first set of elements.
@@ -232,10 +420,25 @@ def hamming_distance(set1: set, set2: set) -> int:
     Returns:
     int: The Hamming distance between the two sets.
     """
-    return len(set1 ^ set2)
+    return len(set1) + len(set2) - 2 * len(set1 & set2)
+
+
+@hamming_distance.register
+def _hamming_distance_bits(set1: int, set2: int) -> int:
+    """
+    Calculate the Hamming distance between two bitsets.
 
+    Parameters:
+    set1 : The first bitset.
+    set2 : The second bitset.
 
-@validate_input()
+    Returns:
+    int: The Hamming distance between the two bitsets.
+    """
+    return hamming_bits(set1, set2)
+
+
+@validate_input(cache=True)
 def hamming_coefficient(set1: set,
                         set2: set,
                         total_range: typing.Optional[set] = None,
@@ -254,8 +457,653 @@ def hamming_coefficient(set1: set,
     Returns:
     float: The Hamming coefficient, a value between 0 and 1.
     """
-    all_: set = set1 | set2 if not total_range else total_range
-    return hamming_distance(set1, set2) / len(all_)
+    # Identical sets differ on no position
+    if set1 is set2:
+        return 0.0
+    distance: int = hamming_distance(set1, set2)
+    # |set1| + |set2| counts the union once plus the intersection once, while
+    # the distance is the union minus the intersection
+    size: int = (len(total_range) if total_range
+                 else (len(set1) + len(set2) + distance) // 2)
+    return distance / size
+
+
+def _interval_bounds(interval: typing.Union[tuple[int, int], range]
+                     ) -> tuple[int, int]:
+    """
+    Get the bounds of an integer interval.
+
+    Parameters:
+    interval: The interval as a (start, end) tuple, end excluded, or as a
+    range with a step of 1.
+
+    Raises:
+    ValueError: If the range has a step other than 1.
+
+    Returns:
+    tuple: The start and end of the interval, end excluded and never before
+    the start.
+    """
+    if isinstance(interval, range):
+        if interval.step != 1:
+            raise ValueError(
+                "The provided range is incorrect; its step can only be 1")
+        return interval.start, max(interval.start, interval.stop)
+    # Reversed bounds are an empty interval, just like an empty range
+    start, end = interval
+    return start, max(start, end)
+
+
+def _interval_cardinalities(interval1: typing.Union[tuple[int, int], range],
+                            interval2: typing.Union[tuple[int, int], range]
+                            ) -> tuple[int, int, int]:
+    """
+    Calculate the sizes of the intersection and of two integer intervals.
+
+    Parameters:
+    interval1: The first interval.
+    interval2: The second interval.
+
+    Returns:
+    tuple: The size of the intersection, of interval1 and of interval2.
+    """
+    start1, end1 = _interval_bounds(interval1)
+    start2, end2 = _interval_bounds(interval2)
+    intersection: int = max(0, min(end1, end2) - max(start1, start2))
+    return intersection, end1 - start1, end2 - start2
+
+
+def jaccard_interval(interval1: typing.Union[tuple[int, int], range],
+                     interval2: typing.Union[tuple[int, int], range]
+                     ) -> float:
+    """
+    Calculate the Jaccard coefficient between two integer intervals.
+
+    For sets of consecutive integers, such as set(range(lo, hi)), the sizes
+    of the intersection and union follow from the bounds, so no set has to
+    be built.
+
+    Parameters:
+    interval1: The first interval as a (start, end) tuple, end excluded, or
+    as a range with a step of 1.
+    interval2: The second interval as a (start, end) tuple, end excluded, or
+    as a range with a step of 1.
+
+    Raises:
+    ValueError: If a range has a step other than 1.
+
+    Returns:
+    float: The Jaccard coefficient, 0 if both intervals are empty.
+    """
+    intersection, size1, size2 = _interval_cardinalities(interval1,
+                                                         interval2)
+    union: int = size1 + size2 - intersection
+    return intersection / union if union else 0.0
+
+
+def overlap_interval(interval1: typing.Union[tuple[int, int], range],
+                     interval2: typing.Union[tuple[int, int], range]
+                     ) -> float:
+    """
+    Calculate the overlap coefficient between two integer intervals.
+
+    Parameters:
+    interval1: The first interval as a (start, end) tuple, end excluded, or
+    as a range with a step of 1.
+    interval2: The second interval as a (start, end) tuple, end excluded, or
+    as a range with a step of 1.
+
+    Raises:
+    ValueError: If a range has a step other than 1.
+
+    Returns:
+    float: The overlap coefficient, 0 if either interval is empty.
+    """
+    intersection, size1, size2 = _interval_cardinalities(interval1,
+                                                         interval2)
+    smallest: int = min(size1, size2)
+    return intersection / smallest if smallest else 0.0
+
+
+def dice_interval(interval1: typing.Union[tuple[int, int], range],
+                  interval2: typing.Union[tuple[int, int], range]
+                  ) -> float:
+    """
+    Calculate the Dice-Sørensen coefficient between two integer intervals.
+
+    Parameters:
+    interval1: The first interval as a (start, end) tuple, end excluded, or
+    as a range with a step of 1.
+    interval2: The second interval as a (start, end) tuple, end excluded, or
+    as a range with a step of 1.
+
+    Raises:
+    ValueError: If a range has a step other than 1.
+
+    Returns:
+    float: The Dice-Sørensen coefficient, 0 if both intervals are empty.
+    """
+    intersection, size1, size2 = _interval_cardinalities(interval1,
+                                                         interval2)
+    total: int = size1 + size2
+    return 2 * intersection / total if total else 0.0
+
+
+class Coefficients(typing.NamedTuple):
+    """All similarity coefficients between two sets, as given by compute_all.
+    """
+    overlap: float
+    jaccard: float
+    dice: float
+    cosine: float
+    simple_matching: float
+    hamming: float
+
+
+@validate_input("one", cache=True)
+def compute_all(set1: set,
+                set2: set,
+                total_range: typing.Optional[set] = None,
+                /) -> Coefficients:
+    """
+    Calculate all similarity coefficients between two sets at once.
+
+    The intersection is built once and every coefficient is derived from its
+    size and the sizes of the sets, which is cheaper than calling each
+    coefficient function separately.
+
+    Parameters:
+    set1: The first set.
+    set2: The second set.
+    total_range: The entire set of all options, default is None.
+
+    Returns:
+    Coefficients: The overlap, Jaccard, Dice-Sørensen, cosine, simple
+    matching and Hamming coefficients between the two sets.
+    """
+    intersection: int = len(set1 & set2)
+    size1: int = len(set1)
+    size2: int = len(set2)
+    union: int = size1 + size2 - intersection
+    universe: int = len(total_range) if total_range else union
+    return Coefficients(
+        overlap=intersection / min(size1, size2),
+        jaccard=intersection / union,
+        dice=2 * intersection / (size1 + size2),
+        cosine=intersection / math.sqrt(size1 * size2),
+        simple_matching=(intersection + universe - union) / universe,
+        hamming=(union - intersection) / universe)
+
+
+@functools.lru_cache(maxsize=32)
+def _vocab_index(vocab: frozenset) -> dict[typing.Any, int]:
+    """
+    Map every element of a vocabulary to a bit position.
+
+    Parameters:
+    vocab: The elements that can occur in the bitsets.
+
+    Returns:
+    dict: A mapping from element to bit position.
+    """
+    return {element: position for position, element in enumerate(vocab)}
+
+
+def _to_bitset(set_: set, vocab_index: dict[typing.Any, int]) -> int:
+    """
+    Pack a set into an integer bitset using the provided vocabulary index.
+
+    Parameters:
+    set_: The set to pack.
+    vocab_index: A mapping from element to bit position.
+
+    Returns:
+    int: The bitset with a bit set for every element of the set.
+    """
+    # Setting bits in a buffer keeps the packing linear, whereas OR-ing into
+    # an integer would copy the growing integer for every element
+    buffer: bytearray = bytearray((len(vocab_index) + 7) // 8)
+    for element in set_:
+        position: int = vocab_index[element]
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _to_dense_bitset(set_: set, size: int) -> int:
+    """
+    Pack a set of non-negative integers into a bitset, using every integer as
+    its own bit position.
+
+    Parameters:
+    set_: The set to pack.
+    size: The number of bit positions, larger than every element.
+
+    Returns:
+    int: The bitset with a bit set for every element of the set.
+    """
+    buffer: bytearray = bytearray((size + 7) // 8)
+    for element in set_:
+        buffer[element >> 3] |= 1 << (element & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _popcount64(word: int) -> int:
+    """
+    Count the number of set bits in a 64-bit word without branching (SWAR).
+
+    Parameters:
+    word: The word to count, between 0 and 2**64 - 1.
+
+    Returns:
+    int: The number of set bits.
+    """
+    word -= (word >> 1) & 0x5555555555555555
+    word = (word & 0x3333333333333333) + ((word >> 2) & 0x3333333333333333)
+    word = (word + (word >> 4)) & 0x0F0F0F0F0F0F0F0F
+    return ((word * 0x0101010101010101) & 0xFFFFFFFFFFFFFFFF) >> 56
+
+
+def _popcount_words(bitset: int) -> int:
+    """
+    Count the number of set bits in a bitset, one 64-bit word at a time.
+
+    Parameters:
+    bitset: The non-negative bitset to count.
+
+    Returns:
+    int: The number of set bits.
+    """
+    size: int = (bitset.bit_length() + 63) // 64 * 8
+    # The byte order does not matter for counting bits
+    words = memoryview(bitset.to_bytes(size, "little")).cast("Q")
+    return sum(_popcount64(word) for word in words)
+
+
+# Count the set bits in a bitset; int.bit_count is a C-level popcount that is
+# available from Python 3.10 onwards, older versions use the SWAR fallback
+_popcount: typing.Callable[[int], int] = getattr(int,
+                                                 "bit_count",
+                                                 _popcount_words)
+
+
+def to_bitsets(*sets: set,
+               vocab: typing.Optional[typing.Iterable] = None) -> list[int]:
+    """
+    Convert sets into integer bitsets sharing the same bit positions.
+
+    Bitsets are worth building when the same sets are compared many times, as
+    the cardinality of an intersection or union then becomes a popcount.
+
+    Parameters:
+    sets: The sets to convert.
+    vocab: The elements that can occur in the sets, default is None in which
+    case the union of the sets is used.
+
+    Returns:
+    list: A bitset for every provided set.
+    """
+    elements: frozenset = (frozenset().union(*sets) if vocab is None
+                           else frozenset(vocab))
+    # Integer identifiers that are not too sparse are their own bit positions,
+    # which skips interning them through the vocabulary index. Only without
+    # an explicit vocabulary, as the bounds of the vocabulary say nothing
+    # about elements of the sets outside of it
+    if (vocab is None
+            and elements
+            and all(type(element) is int for element in elements)
+            and min(elements) >= 0
+            and max(elements) < _DENSE_FACTOR * len(elements)):
+        size: int = max(elements) + 1
+        return [_to_dense_bitset(s, size) for s in sets]
+    vocab_index: dict[typing.Any, int] = _vocab_index(elements)
+    return [_to_bitset(s, vocab_index) for s in sets]
+
+
+def overlap_bits(bits1: int, bits2: int) -> float:
+    """
+    Calculate the overlap coefficient between two bitsets.
+
+    Parameters:
+    bits1: The first bitset.
+    bits2: The second bitset.
+
+    Returns:
+    float: The overlap coefficient, 0 if one of the bitsets is empty.
+    """
+    smallest: int = min(_popcount(bits1), _popcount(bits2))
+    return _popcount(bits1 & bits2) / smallest if smallest else 0.0
+
+
+def jaccard_bits(bits1: int, bits2: int) -> float:
+    """
+    Calculate the Jaccard coefficient between two bitsets.
+
+    Parameters:
+    bits1: The first bitset.
+    bits2: The second bitset.
+
+    Returns:
+    float: The Jaccard coefficient, 0 if both bitsets are empty.
+    """
+    union: int = _popcount(bits1 | bits2)
+    return _popcount(bits1 & bits2) / union if union else 0.0
+
+
+def dice_bits(bits1: int, bits2: int) -> float:
+    """
+    Calculate the Dice-Sørensen coefficient between two bitsets.
+
+    Parameters:
+    bits1: The first bitset.
+    bits2: The second bitset.
+
+    Returns:
+    float: The Dice-Sørensen coefficient, 0 if both bitsets are empty.
+    """
+    total: int = _popcount(bits1) + _popcount(bits2)
+    return 2 * _popcount(bits1 & bits2) / total if total else 0.0
+
+
+def cosine_bits(bits1: int, bits2: int) -> float:
+    """
+    Calculate the cosine similarity between two bitsets.
+
+    Parameters:
+    bits1: The first bitset.
+    bits2: The second bitset.
+
+    Returns:
+    float: The cosine similarity, 0 if the bitsets have no bit in common.
+    """
+    intersection: int = _popcount(bits1 & bits2)
+    if intersection == 0:
+        return 0.0
+    return intersection / math.sqrt(_popcount(bits1) * _popcount(bits2))
+
+
+def hamming_bits(bits1: int, bits2: int) -> int:
+    """
+    Calculate the Hamming distance between two bitsets.
+
+    Parameters:
+    bits1: The first bitset.
+    bits2: The second bitset.
+
+    Returns:
+    int: The number of bits set in exactly one of the bitsets.
+    """
+    return _popcount(bits1 ^ bits2)
+
+
+def _inverse_norm(bits: int) -> tuple[int, float]:
+    """
+    Calculate the size and the inverse of the Euclidean norm of a bitset.
+
+    Parameters:
+    bits: The bitset.
+
+    Returns:
+    tuple: |bits| and 1 / sqrt(|bits|), the latter 0 if the bitset is empty.
+    """
+    size: int = _popcount(bits)
+    return size, 1 / math.sqrt(size) if size else 0.0
+
+
+def _overlap_score(intersection: int, size1: int, size2: int) -> float:
+    """Calculate the overlap coefficient from the set sizes."""
+    smallest: int = min(size1, size2)
+    return intersection / smallest if smallest else 0.0
+
+
+def _jaccard_score(intersection: int, size1: int, size2: int) -> float:
+    """Calculate the Jaccard coefficient from the set sizes."""
+    union: int = size1 + size2 - intersection
+    return intersection / union if union else 0.0
+
+
+def _dice_score(intersection: int, size1: int, size2: int) -> float:
+    """Calculate the Dice-Sørensen coefficient from the set sizes."""
+    total: int = size1 + size2
+    return 2 * intersection / total if total else 0.0
+
+
+def _cosine_score(intersection: int,
+                  norm1: tuple[int, float],
+                  norm2: tuple[int, float]) -> float:
+    """Calculate the cosine similarity from the sizes and inverse norms."""
+    size1, inverse_norm1 = norm1
+    size2, inverse_norm2 = norm2
+    # Equal sets are exactly 1, which the product of the rounded inverse
+    # norms is not for every size
+    if intersection and intersection == size1 == size2:
+        return 1.0
+    return intersection * inverse_norm1 * inverse_norm2
+
+
+# For every metric of all_pairs: the statistic computed once per bitset and
+# the score computed per pair from the intersection size and both statistics
+_PAIR_METRICS: dict[str, tuple[typing.Callable, typing.Callable]] = {
+    "overlap": (_popcount, _overlap_score),
+    "jaccard": (_popcount, _jaccard_score),
+    "dice": (_popcount, _dice_score),
+    "cosine": (_inverse_norm, _cosine_score),
+    }
+
+
+def _pair_metric(metric: str) -> tuple[typing.Callable, typing.Callable]:
+    """
+    Look up the per-set statistic and pair score of a metric.
+
+    Parameters:
+    metric: The name of the metric.
+
+    Raises:
+    ValueError: If the metric is not one of the supported coefficients.
+
+    Returns:
+    tuple: The per-set statistic and the pair score functions.
+    """
+    if metric not in _PAIR_METRICS:
+        raise ValueError(
+            "The provided metric is incorrect; it can only be 'overlap', "
+            "'jaccard', 'dice' or 'cosine'")
+    return _PAIR_METRICS[metric]
+
+
+def all_pairs(sets: list[set],
+              metric: str = "jaccard",
+              vocab: typing.Optional[typing.Iterable] = None,
+              on_empty: str = "zero"
+              ) -> list[list[float]]:
+    """
+    Calculate a similarity coefficient between all pairs of sets.
+
+    The sets are packed into bitsets once and the per-set statistic (size or
+    norm) is computed once, so every pair costs a single AND and popcount
+    plus some arithmetic.
+
+    Parameters:
+    sets: The sets to compare.
+    metric: The coefficient to calculate: "overlap", "jaccard", "dice" or
+    "cosine", default is "jaccard".
+    vocab: The elements that can occur in the sets, default is None in which
+    case the union of the sets is used.
+    on_empty: What to do if any set is empty: "zero", "warn" or "raise",
+    default is "zero".
+
+    Raises:
+    ValueError: If the metric is not one of the supported coefficients, if
+                on_empty is incorrect or if a set is empty and on_empty is
+                "raise".
+    TypeError: If any argument is not a set or if elements are of
+               different types.
+
+    Returns:
+    list: A square matrix where entry [i][j] is the coefficient between
+    sets[i] and sets[j], 0 where it is undefined because of empty sets.
+    """
+    statistic, score = _pair_metric(metric)
+    # Iterators are materialised once, as they are validated and packed
+    sets = list(sets)
+    _validate_sets(sets, on_empty)
+    bitsets: list[int] = to_bitsets(*sets, vocab=vocab)
+    statistics: list = [statistic(bits) for bits in bitsets]
+    size: int = len(bitsets)
+    matrix: list[list[float]] = [[0.0] * size for _ in range(size)]
+    # All metrics are symmetric, so only the upper triangle is computed and
+    # mirrored into the lower triangle
+    for i, (bits1, statistic1) in enumerate(zip(bitsets, statistics)):
+        row: list[float] = matrix[i]
+        for j in range(i, size):
+            value: float = score(_popcount(bits1 & bitsets[j]),
+                                 statistic1,
+                                 statistics[j])
+            row[j] = value
+            matrix[j][i] = value
+    return matrix
+
+
+# The all_pairs metric matching every coefficient function
+_METHOD_METRICS: dict[typing.Callable, str] = {
+    overlap_coefficient: "overlap",
+    jaccard_similarity: "jaccard",
+    dice_sørensen_coefficient: "dice",
+    cosine_similarity: "cosine",
+    }
+
+
+def pairwise(method: typing.Callable,
+             sets_a: list[set],
+             sets_b: list[set],
+             vocab: typing.Optional[typing.Iterable] = None,
+             on_empty: str = "zero"
+             ) -> list[list[float]]:
+    """
+    Calculate a similarity coefficient between every set of two collections.
+
+    Both collections are packed into bitsets over the same vocabulary once,
+    so every pair costs a single AND and popcount plus some arithmetic.
+
+    Parameters:
+    method: The coefficient function: overlap_coefficient,
+    jaccard_similarity, dice_sørensen_coefficient or cosine_similarity.
+    sets_a: The sets for the rows of the matrix.
+    sets_b: The sets for the columns of the matrix.
+    vocab: The elements that can occur in the sets, default is None in which
+    case the union of the sets is used.
+    on_empty: What to do if any set is empty: "zero", "warn" or "raise",
+    default is "zero".
+
+    Raises:
+    ValueError: If the method has no batched implementation, if on_empty is
+                incorrect or if a set is empty and on_empty is "raise".
+    TypeError: If any argument is not a set or if elements are of
+               different types.
+
+    Returns:
+    list: A matrix where entry [i][j] is the coefficient between sets_a[i]
+    and sets_b[j], 0 where it is undefined because of empty sets.
+    """
+    if method not in _METHOD_METRICS:
+        raise ValueError(
+            "The provided method is incorrect; it can only be "
+            "overlap_coefficient, jaccard_similarity, "
+            "dice_sørensen_coefficient or cosine_similarity")
+    statistic, score = _pair_metric(_METHOD_METRICS[method])
+    # Iterators are materialised once, as they are validated and packed
+    sets_a, sets_b = list(sets_a), list(sets_b)
+    _validate_sets((*sets_a, *sets_b), on_empty)
+    bitsets: list[int] = to_bitsets(*sets_a, *sets_b, vocab=vocab)
+    statistics: list = [statistic(bits) for bits in bitsets]
+    split: int = len(sets_a)
+    rows: list[tuple] = list(zip(bitsets[:split], statistics[:split]))
+    columns: list[tuple] = list(zip(bitsets[split:], statistics[split:]))
+    return [[score(_popcount(bits1 & bits2), statistic1, statistic2)
+             for bits2, statistic2 in columns]
+            for bits1, statistic1 in rows]
+
+
+def top_k_jaccard(sets: list[set], k: int) -> list[list[tuple[int, float]]]:
+    """
+    Find the k most Jaccard-similar other sets for every set.
+
+    Only pairs that share at least one element can have a non-zero Jaccard
+    coefficient, so the candidates are found through an inverted index from
+    element to sets, which also yields the intersection sizes. Pairs without
+    a common element are never visited.
+
+    Parameters:
+    sets: The sets to compare.
+    k: The number of most similar sets to return for every set.
+
+    Raises:
+    ValueError: If k is smaller than 1.
+    TypeError: If any argument is not a set or if elements are of
+               different types.
+
+    Returns:
+    list: For every set, up to k (index, Jaccard coefficient) tuples of the
+    other sets it shares elements with, most similar first and lowest index
+    first among ties.
+    """
+    if k < 1:
+        raise ValueError("The provided k is incorrect; it must be at least 1")
+    # Iterators are materialised once, as they are validated and indexed
+    sets = list(sets)
+    _validate_sets(sets)
+    postings: collections.defaultdict = collections.defaultdict(list)
+    for index, s in enumerate(sets):
+        for element in s:
+            postings[element].append(index)
+    top: list[list[tuple[int, float]]] = []
+    for index, s in enumerate(sets):
+        intersections: collections.Counter = collections.Counter()
+        for element in s:
+            intersections.update(postings[element])
+        del intersections[index]
+        size: int = len(s)
+        top.append(heapq.nlargest(
+            k,
+            ((other, intersection / (size + len(sets[other]) - intersection))
+             for other, intersection in intersections.items()),
+            key=lambda pair: (pair[1], -pair[0])))
+    return top
+
+
+def jaccard_cdist(sets: list[set],
+                  vocab: typing.Optional[typing.Iterable] = None
+                  ) -> list[list[float]]:
+    """
+    Calculate the Jaccard coefficient between all pairs of sets.
+
+    Parameters:
+    sets: The sets to compare.
+    vocab: The elements that can occur in the sets, default is None in which
+    case the union of the sets is used.
+
+    Returns:
+    list: A square matrix where entry [i][j] is the Jaccard coefficient
+    between sets[i] and sets[j], 0 if both sets are empty.
+    """
+    return all_pairs(sets, "jaccard", vocab)
+
+
+def cosine_cdist(sets: list[set],
+                 vocab: typing.Optional[typing.Iterable] = None
+                 ) -> list[list[float]]:
+    """
+    Calculate the cosine similarity between all pairs of sets.
+
+    Parameters:
+    sets: The sets to compare.
+    vocab: The elements that can occur in the sets, default is None in which
+    case the union of the sets is used.
+
+    Returns:
+    list: A square matrix where entry [i][j] is the cosine similarity
+    between sets[i] and sets[j], 0 if one of the sets is empty.
+    """
+    return all_pairs(sets, "cosine", vocab)
 
 
 def demo():
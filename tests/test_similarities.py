@@ -12,27 +12,107 @@ matching coefficient, Hamming distance, and Hamming coefficient.
 """
 
 # Standard library
+import math
+import pickle
 import typing
+import warnings
 # Third party
 import pytest
 # Local
 import sna_toolbox.src.similarities as similarities
 
 
-def _test_no_match(method: typing.Callable[[typing.Set[typing.Any],
-                                            typing.Set[typing.Any]],
-                                           float]) -> None:
-    """Test case for no match between two sets."""
-    result = method(set(range(10)), set(range(10, 15)))
-    assert result == 0
-
-
-def _test_full_match(method: typing.Callable[[typing.Set[typing.Any],
-                                              typing.Set[typing.Any]],
-                                             float]) -> None:
-    """Test case for full match between two sets."""
-    result = method(set(range(10)), set(range(10)))
-    assert round(result) == 1
+# The coefficient functions validated with option "one" give None for empty
+# sets, the others give 0
+_COEFFICIENTS: list[tuple[typing.Callable, typing.Optional[int]]] = [
+    (similarities.overlap_coefficient, None),
+    (similarities.jaccard_similarity, 0),
+    (similarities.dice_sørensen_coefficient, 0),
+    (similarities.cosine_similarity, None),
+    (similarities.simple_matching_coefficient, None),
+    ]
+
+
+# Constant test sets, built once for the whole module
+SET_0_10: frozenset = frozenset(range(10))
+SET_0_10_COPY: frozenset = frozenset(range(10))
+SET_10_15: frozenset = frozenset(range(10, 15))
+# Example sets from the literature
+JAC_A1: frozenset = frozenset({0, 1, 2, 5, 6, 8, 9})
+JAC_B1: frozenset = frozenset({0, 2, 3, 4, 5, 7, 9})
+DICE_A: frozenset = frozenset({"ni", "ig", "gh", "ht"})
+DICE_B: frozenset = frozenset({"na", "ac", "ch", "ht"})
+SMC_A: frozenset = frozenset({"a", "b", "c", "d"})
+SMC_B: frozenset = frozenset({"b"})
+COS_A: frozenset = frozenset("the best data science course".split(" "))
+COS_B: frozenset = frozenset("data science is popular".split(" "))
+# The bounds of the sliding range pairs from the examples of Nefi Alcron
+RANGE_BOUNDS: list[tuple[int, int]] = list(zip(range(100, 151, 10),
+                                               range(0, 51, 10)))
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    """Empty the result cache, so every test runs the coefficient code."""
+    similarities.clear_cache()
+
+
+@pytest.fixture(scope="module")
+def disjoint_pair() -> tuple[frozenset, frozenset]:
+    """Two sets without common elements."""
+    return SET_0_10, SET_10_15
+
+
+@pytest.fixture(scope="module")
+def identical_pair() -> tuple[frozenset, frozenset]:
+    """Two distinct but equal sets."""
+    return SET_0_10, SET_0_10_COPY
+
+
+@pytest.fixture(scope="module")
+def range_pairs() -> list[tuple[frozenset, frozenset]]:
+    """The sliding range pairs from the examples of Nefi Alcron."""
+    return [(frozenset(range(a)), frozenset(range(50+b, 150)))
+            for a, b in RANGE_BOUNDS]
+
+
+@pytest.fixture(scope="module")
+def empty_pair() -> tuple[frozenset, frozenset]:
+    """Two empty sets."""
+    return frozenset(), frozenset()
+
+
+# The bitset kernel matching every set-based coefficient
+_BIT_COEFFICIENTS: dict[typing.Callable, typing.Callable] = {
+    similarities.overlap_coefficient: similarities.overlap_bits,
+    similarities.jaccard_similarity: similarities.jaccard_bits,
+    similarities.dice_sørensen_coefficient: similarities.dice_bits,
+    similarities.cosine_similarity: similarities.cosine_bits,
+    }
+
+
+@pytest.fixture(params=["sets", "bitsets"])
+def backend(request: pytest.FixtureRequest) -> typing.Callable:
+    """Calculate a coefficient on the sets or on their packed bitsets."""
+    def calculate(method: typing.Callable, set1: set, set2: set) -> float:
+        if request.param == "sets":
+            return method(set1, set2)
+        return _BIT_COEFFICIENTS[method](*similarities.to_bitsets(set1, set2))
+    return calculate
+
+
+def _expect_warn(message: str,
+                 func: typing.Callable,
+                 *args: typing.Any,
+                 **kwargs: typing.Any) -> typing.Any:
+    """Call the function, expecting exactly one UserWarning with the given
+    message."""
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        result = func(*args, **kwargs)
+    assert [(warning.category, str(warning.message)) for warning in record]\
+        == [(UserWarning, message)]
+    return result
 
 
 class TestInputValidation:
@@ -48,6 +128,18 @@ class TestInputValidation:
             def func() -> None:
                 pass
 
+    def test_pickle(self) -> None:
+        """Test that decorated functions can be pickled by reference."""
+        for method, _ in _COEFFICIENTS:
+            assert pickle.loads(pickle.dumps(method)) is method
+
+    def test_cached_decorator(self) -> None:
+        """Test that the same option gives the same decorator."""
+        assert similarities.validate_input("one") is\
+            similarities.validate_input("one")
+        assert similarities.validate_input() is not\
+            similarities.validate_input("one")
+
     def test_invalid_input(self) -> None:
         """Test for invalid input types."""
         @similarities.validate_input()
@@ -71,30 +163,24 @@ class TestInputValidation:
         @similarities.validate_input("one")
         def func() -> None:
             pass
-        with pytest.warns() as record:
-            result = func({1}, set())
+        result = _expect_warn("At least one of the sets must be non-empty.",
+                              func, {1}, set())
         assert result is None
-        assert str(record[0].message) ==\
-            "At least one of the sets must be non-empty."
 
     def test_two_empty_sets(self) -> None:
         """Test for two empty sets."""
         @similarities.validate_input()
         def func() -> None:
             pass
-        with pytest.warns() as record:
-            result = func(set(), set())
+        result = _expect_warn("Both sets are empty!", func, set(), set())
         assert result == 0
-        assert str(record[0].message) == "Both sets are empty!"
 
         @similarities.validate_input("one")
         def func() -> None:
             pass
-        with pytest.warns() as record:
-            result = func(set(), set())
+        result = _expect_warn("At least one of the sets must be non-empty.",
+                              func, set(), set())
         assert result is None
-        assert str(record[0].message) ==\
-            "At least one of the sets must be non-empty."
 
     def test_uneven_types(self) -> None:
         """Test for not the same types in sets."""
@@ -113,54 +199,103 @@ class TestInputValidation:
         @similarities.validate_input()
         def func(*args) -> None:
             pass
-        with pytest.warns() as record:
-            result = func({1}, {2}, {3})
+        result = _expect_warn(
+            "The total range provided is not a superset of the other two "
+            "sets",
+            func, {1}, {2}, {3})
         assert result is None
-        assert str(record[0].message) ==\
-            "The total range provided is not a superset of the other two sets"
 
 
-class TestOverlapCoefficient:
+@pytest.mark.parametrize("method, empty_result", _COEFFICIENTS)
+class TestCoefficients:
+    """Test cases shared by all similarity coefficients."""
+
+    def test_no_match(self,
+                      method: typing.Callable,
+                      empty_result: typing.Optional[int],
+                      disjoint_pair: tuple[frozenset, frozenset]) -> None:
+        """Test for no match between two sets."""
+        assert method(*disjoint_pair) == 0
+
+    def test_full_match(self,
+                        method: typing.Callable,
+                        empty_result: typing.Optional[int],
+                        identical_pair: tuple[frozenset, frozenset]) -> None:
+        """Test for full match between two sets."""
+        assert method(*identical_pair) == pytest.approx(1)
+
+    def test_empty_sets(self,
+                        method: typing.Callable,
+                        empty_result: typing.Optional[int],
+                        empty_pair: tuple[frozenset, frozenset]) -> None:
+        """Test that two empty sets give None or 0 with a warning."""
+        message = ("At least one of the sets must be non-empty."
+                   if empty_result is None else "Both sets are empty!")
+        assert _expect_warn(message, method, *empty_pair) == empty_result
+
+    def test_one_empty_set(self,
+                           method: typing.Callable,
+                           empty_result: typing.Optional[int]) -> None:
+        """Test that one empty set gives None with a warning or 0."""
+        if empty_result is None:
+            result = _expect_warn(
+                "At least one of the sets must be non-empty.",
+                method, {1}, set())
+            assert result is None
+        else:
+            assert method({1}, set()) == 0
+
+    def test_invalid_input(self,
+                           method: typing.Callable,
+                           empty_result: typing.Optional[int]) -> None:
+        """Test for invalid input types."""
+        with pytest.raises(TypeError,
+                           match="All arguments must be sets!"):
+            method({1}, [1])
+
+    def test_uneven_types(self,
+                          method: typing.Callable,
+                          empty_result: typing.Optional[int]) -> None:
+        """Test for not the same types in sets."""
+        with pytest.raises(
+                TypeError,
+                match="Elements in the sets must be of the same type."):
+            method({1, 2, 3}, {"f"})
 
-    def test_no_match(self) -> None:
-        """Test for no match in overlap coefficient."""
-        _test_no_match(similarities.overlap_coefficient)
 
-    def test_full_match(self) -> None:
-        """Test for full match in overlap coefficient."""
-        _test_full_match(similarities.overlap_coefficient)
+class TestOverlapCoefficient:
 
-    def test_example_overlap(self) -> None:
+    def test_example_overlap(self,
+                             backend: typing.Callable,
+                             range_pairs: list[tuple[frozenset, frozenset]]
+                             ) -> None:
         """Test the overlap coefficient with example sets.
         https://developer.nvidia.com/blog/similarity-in-graphs-jaccard-versus-the-overlap-coefficient/  # noqa: E501
         """
         # Example from Nefi Alcron
-        result = similarities.overlap_coefficient({2, 3, 4, 5},
-                                                  {1, 3, 4, 5})
+        result = backend(similarities.overlap_coefficient,
+                         {2, 3, 4, 5},
+                         {1, 3, 4, 5})
         assert result == 0.75
-        # Example from Nefi Alcron
-        results = []
-        for a, b in zip(range(100, 151, 10), range(0, 51, 10)):
-            seta = set(range(a))
-            setb = set(range(50+b, 150))
-            results.append(round(similarities.overlap_coefficient(seta,
-                                                                  setb),
-                                 3)
-                           )
-        assert results == [0.5, 0.556, 0.625, 0.714, 0.833, 1]
+        # Example from Nefi Alcron, all pairs scored in one batch
+        setsa, setsb = zip(*range_pairs)
+        matrix = similarities.pairwise(similarities.overlap_coefficient,
+                                       setsa,
+                                       setsb)
+        results = [matrix[i][i] for i in range(len(setsa))]
+        assert results == pytest.approx([0.5, 0.556, 0.625, 0.714, 0.833, 1],
+                                        abs=5e-4)
+        # The same example on the interval bounds
+        assert results == [similarities.overlap_interval((0, a), (50+b, 150))
+                           for a, b in RANGE_BOUNDS]
 
 
 class TestJaccardCoeffienct:
 
-    def test_no_match(self) -> None:
-        """Test for no match in jaccard similarity."""
-        _test_no_match(similarities.jaccard_similarity)
-
-    def test_full_match(self) -> None:
-        """Test for full match in jaccard similarity."""
-        _test_full_match(similarities.jaccard_similarity)
-
-    def test_example_jaccard(self) -> None:
+    def test_example_jaccard(self,
+                             backend: typing.Callable,
+                             range_pairs: list[tuple[frozenset, frozenset]]
+                             ) -> None:
         """Test the Jaccard similarity with example sets.
         https://www.statology.org/jaccard-similarity/
         https://developer.nvidia.com/blog/similarity-in-graphs-jaccard-versus-the-overlap-coefficient/  # noqa: E501
@@ -169,128 +304,119 @@ class TestJaccardCoeffienct:
         https://medium.com/@mayurdhvajsinhjadeja/jaccard-similarity-34e2c15fb524
         """
         # Example from Zach Bobbitt
-        result = similarities.jaccard_similarity({0, 1, 2, 5, 6, 8, 9},
-                                                 {0, 2, 3, 4, 5, 7, 9})
+        result = backend(similarities.jaccard_similarity, JAC_A1, JAC_B1)
         assert result == 0.4
         set_a = {"cat", "dog", "hippo", "monkey"}
         set_b = {"monkey", "rhino", "ostrich", "salmon"}
-        result = similarities.jaccard_similarity(set_a, set_b)
-        assert round(result, 3) == 0.143
+        result = backend(similarities.jaccard_similarity, set_a, set_b)
+        assert result == pytest.approx(0.143, abs=5e-4)
         # Example from Nefi Alcron
-        result = similarities.jaccard_similarity({2, 3, 4, 5},
-                                                 {1, 3, 4, 5})
+        result = backend(similarities.jaccard_similarity,
+                         {2, 3, 4, 5},
+                         {1, 3, 4, 5})
         assert result == 0.6
         # Example from Fatih Karabiber
-        result = similarities.jaccard_similarity({0, 1, 2, 5, 6},
-                                                 {0, 2, 3, 4, 5, 7, 9})
-        assert round(result, 2) == 0.33
-        # Example from Nefi Alcron
-        results = []
-        for a, b in zip(range(100, 151, 10), range(0, 51, 10)):
-            seta = set(range(a))
-            setb = set(range(50+b, 150))
-            results.append(round(similarities.jaccard_similarity(seta,
-                                                                 setb),
-                                 3)
-                           )
-        assert results == [0.333] * 6
+        result = backend(similarities.jaccard_similarity,
+                         {0, 1, 2, 5, 6},
+                         {0, 2, 3, 4, 5, 7, 9})
+        assert result == pytest.approx(0.33, abs=5e-3)
+        # Example from Nefi Alcron, all pairs scored in one batch
+        setsa, setsb = zip(*range_pairs)
+        matrix = similarities.pairwise(similarities.jaccard_similarity,
+                                       setsa,
+                                       setsb)
+        results = [matrix[i][i] for i in range(len(setsa))]
+        assert results == pytest.approx([0.333] * 6, abs=5e-4)
+        # The same example on the interval bounds
+        results = [similarities.jaccard_interval((0, a), (50+b, 150))
+                   for a, b in RANGE_BOUNDS]
+        assert results == pytest.approx([0.333] * 6, abs=5e-4)
         # Example from Kardi Teknomo
-        result = similarities.jaccard_similarity({7, 3, 2, 4, 1},
-                                                 {4, 1, 9, 7, 5})
-        assert round(result, 3) == 0.429
+        result = backend(similarities.jaccard_similarity,
+                         {7, 3, 2, 4, 1},
+                         {4, 1, 9, 7, 5})
+        assert result == pytest.approx(0.429, abs=5e-4)
         # Example from Mayurdhvajsinh Jadeja
         set_c = {"Lion", "Tiger", "Cheetah", "Leopard", "Rhino"}
         set_d = {"Lion", "Monkey", "Cheetah", "Cat", "Dog"}
-        result = similarities.jaccard_similarity(set_c, set_d)
+        result = backend(similarities.jaccard_similarity, set_c, set_d)
         assert result == 0.25
 
-class TestDiceSorensen:
-
-    def test_no_match(self) -> None:
-        """Test for no match in dice sørensen coefficient."""
-        _test_no_match(similarities.dice_sørensen_coefficient)
 
-    def test_full_match(self) -> None:
-        """Test for full match in dice sørensen coefficient."""
-        _test_full_match(similarities.dice_sørensen_coefficient)
+class TestDiceSorensen:
 
-    def test_example_dice(self) -> None:
+    def test_example_dice(self, backend: typing.Callable) -> None:
         """Test the Dice-Sørensen coefficient with example sets.
         https://en.wikipedia.org/wiki/Dice-S%C3%B8rensen_coefficient
         """
         # Example from Wikipedia
-        result = similarities.dice_sørensen_coefficient(
-             {"ni", "ig", "gh", "ht"},
-             {"na", "ac", "ch", "ht"})
+        result = backend(similarities.dice_sørensen_coefficient,
+                         DICE_A,
+                         DICE_B)
         assert result == 0.25
 
 
 class TestCosineSimilarity:
 
-    def test_no_match(self) -> None:
-        """Test for no match in cosine similarity."""
-        _test_no_match(similarities.cosine_similarity)
-
-    def test_full_match(self) -> None:
-        """Test for full match in cosine similarity."""
-        _test_full_match(similarities.cosine_similarity)
-
-    def test_example_cosine(self) -> None:
+    def test_example_cosine(self, backend: typing.Callable) -> None:
         """Test the cosine similarity with example sets.
         https://www.learndatasci.com/glossary/cosine-similarity/
         """
         # Example from Fatih Karabiber
-        result = similarities.cosine_similarity(
-            set("the best data science course".split(" ")),
-            set("data science is popular".split(" ")))
-        assert round(result, 5) == 0.44721
+        result = backend(similarities.cosine_similarity, COS_A, COS_B)
+        assert result == pytest.approx(0.44721, abs=5e-6)
 
 
 class TestSimpleMatchingCoefficient:
 
-    def test_no_match(self) ->  None:
-        """Test for no match in simple matching coefficient."""
-        _test_no_match(similarities.simple_matching_coefficient)
-
-    def test_full_match(self) ->  None:
-        """Test for full match in simple matching coefficient."""
-        _test_full_match(similarities.simple_matching_coefficient)
-
     def test_example_smc(self) -> None:
         """Test the simple matching coefficient with example sets.
         https://people.revoledu.com/kardi/tutorial/Similarity/SimpleMatching.html  # noqa: E501
         """
         # Example from Kardi Teknomo
-        result = similarities.simple_matching_coefficient(
-            {"a", "b", "c", "d"},
-            {"b"})
+        result = similarities.simple_matching_coefficient(SMC_A, SMC_B)
         assert result == 0.25
 
 
 class TestHammingDistance:
 
-    def test_full_overlap(self) -> None:
+    def test_full_overlap(self,
+                          identical_pair: tuple[frozenset, frozenset]
+                          ) -> None:
         """Test for full overlap, expecting a Hamming distance of zero."""
-        result = similarities.hamming_distance(set(range(10)), set(range(10)))
-        assert round(result) == 0
+        result = similarities.hamming_distance(*identical_pair)
+        assert result == 0
 
-    def test_no_overlap(self) -> None:
+    def test_no_overlap(self,
+                        disjoint_pair: tuple[frozenset, frozenset]
+                        ) -> None:
         """Test for no overlap, expecting a Hamming distance equal to the size
         of the union."""
-        result = similarities.hamming_distance(set(range(10)), set(range(10, 15)))
+        result = similarities.hamming_distance(*disjoint_pair)
         assert result == 15
 
+    def test_bitsets(self) -> None:
+        """Test that bitsets are dispatched to the bitset kernel."""
+        set_a, set_b = set(range(10)), set(range(5, 15))
+        bits_a, bits_b = similarities.to_bitsets(set_a, set_b)
+        result = similarities.hamming_distance(bits_a, bits_b)
+        assert result == similarities.hamming_distance(set_a, set_b) == 10
+
 
 class TestHammingCoefficient:
 
-    def test_no_match(self) -> None:
+    def test_no_match(self,
+                      identical_pair: tuple[frozenset, frozenset]
+                      ) -> None:
         """Test for full match in Hamming coefficient, expecting no match."""
-        result = similarities.hamming_coefficient(set(range(10)), set(range(10)))
-        assert round(result) == 0
+        result = similarities.hamming_coefficient(*identical_pair)
+        assert result == 0
 
-    def test_full_match(self) -> None:
+    def test_full_match(self,
+                        disjoint_pair: tuple[frozenset, frozenset]
+                        ) -> None:
         """Test for no match in Hamming coefficient, expecting a full match."""
-        result = similarities.hamming_coefficient(set(range(10)), set(range(10, 15)))
+        result = similarities.hamming_coefficient(*disjoint_pair)
         assert result == 1
 
     def test_example_hamming(self) -> None:
@@ -309,11 +435,403 @@ class TestHammingCoefficient:
         assert result == 0.5, f"Expected 0.5 but got {result}"
 
         # Example from Kardi Teknomo
-        result = similarities.hamming_coefficient(
-            {"a", "b", "c", "d"},
-            {"b"})
+        result = similarities.hamming_coefficient(SMC_A, SMC_B)
         assert result == 0.75
 
 
+class TestBitsets:
+
+    def test_to_bitsets(self) -> None:
+        """Test that bitsets share bit positions over the vocabulary."""
+        bits_a, bits_b = similarities.to_bitsets({1, 2}, {2, 3},
+                                                 vocab=range(4))
+        assert bits_a.bit_count() == 2
+        assert bits_b.bit_count() == 2
+        assert (bits_a & bits_b).bit_count() == 1
+        assert similarities.to_bitsets(set(), vocab=range(4)) == [0]
+
+    def test_integer_positions(self) -> None:
+        """Test that dense integers are used as their own bit positions."""
+        assert similarities.to_bitsets({0, 3}, {3, 5}) == [0b1001, 0b101000]
+        # Sparse integers are interned through the vocabulary instead
+        bits_a, bits_b = similarities.to_bitsets({10 ** 9}, {10 ** 9, 1})
+        assert max(bits_a, bits_b).bit_length() <= 2
+        assert similarities.jaccard_bits(bits_a, bits_b) == 0.5
+
+    def test_out_of_vocab(self) -> None:
+        """Test that elements outside an explicit vocabulary are rejected."""
+        for set_ in [{-1}, {99}]:
+            with pytest.raises(KeyError):
+                similarities.to_bitsets(set_, {15}, vocab=range(16))
+
+    def test_match_set_coefficients(self) -> None:
+        """Test that the bitset coefficients match the set coefficients."""
+        set_a, set_b = JAC_A1, JAC_B1
+        bits_a, bits_b = similarities.to_bitsets(set_a, set_b)
+        assert similarities.overlap_bits(bits_a, bits_b) ==\
+            similarities.overlap_coefficient(set_a, set_b)
+        assert similarities.jaccard_bits(bits_a, bits_b) ==\
+            similarities.jaccard_similarity(set_a, set_b)
+        assert similarities.dice_bits(bits_a, bits_b) ==\
+            similarities.dice_sørensen_coefficient(set_a, set_b)
+        assert similarities.cosine_bits(bits_a, bits_b) ==\
+            similarities.cosine_similarity(set_a, set_b)
+        assert similarities.hamming_bits(bits_a, bits_b) ==\
+            similarities.hamming_distance(set_a, set_b)
+
+    def test_popcount_fallback(self) -> None:
+        """Test the SWAR popcount used when int.bit_count is unavailable."""
+        for bitset in [0, 1, 2 ** 64 - 1, 2 ** 64, 0xF0F0 << 100,
+                       3 ** 200]:
+            assert similarities._popcount_words(bitset) ==\
+                bin(bitset).count("1")
+
+    def test_empty_bitsets(self) -> None:
+        """Test that empty bitsets give a coefficient of zero."""
+        assert similarities.overlap_bits(0, 1) == 0
+        assert similarities.jaccard_bits(0, 0) == 0
+        assert similarities.dice_bits(0, 0) == 0
+        assert similarities.cosine_bits(0, 1) == 0
+
+
+class TestJaccardCdist:
+
+    def test_matches_jaccard_similarity(self) -> None:
+        """Test that every entry matches the pairwise Jaccard similarity."""
+        sets = [JAC_A1, JAC_B1, {2, 3, 4, 5}, {1, 3, 4, 5}]
+        matrix = similarities.jaccard_cdist(sets)
+        for i, set_a in enumerate(sets):
+            for j, set_b in enumerate(sets):
+                assert matrix[i][j] ==\
+                    similarities.jaccard_similarity(set_a, set_b)
+
+    def test_empty_sets(self) -> None:
+        """Test that pairs of empty sets give a coefficient of zero."""
+        assert similarities.jaccard_cdist([set(), set()]) == [[0, 0], [0, 0]]
+
+
+class TestResultCache:
+
+    @pytest.fixture(autouse=True)
+    def _enable_cache(self) -> typing.Iterator[None]:
+        """Turn the result cache on for the duration of a test."""
+        similarities.enable_cache()
+        yield
+        similarities.enable_cache(False)
+
+    def test_frozensets(self) -> None:
+        """Test that frozensets give the same result as sets."""
+        set_a = {0, 1, 2, 5, 6, 8, 9}
+        set_b = {0, 2, 3, 4, 5, 7, 9}
+        result = similarities.jaccard_similarity(frozenset(set_a),
+                                                 frozenset(set_b))
+        assert result == similarities.jaccard_similarity(set_a, set_b)
+
+    def test_cache_hits(self) -> None:
+        """Test that repeated calls on frozensets are served from the cache."""
+        similarities.clear_cache()
+        set_a, set_b = frozenset(range(10)), frozenset(range(5, 15))
+        first = similarities.overlap_coefficient(set_a, set_b)
+        second = similarities.overlap_coefficient(set_a, set_b)
+        assert first == second == 0.5
+        assert similarities._cached_call.cache_info().hits == 1
+        similarities.clear_cache()
+        assert similarities._cached_call.cache_info().currsize == 0
+
+    def test_opt_in(self) -> None:
+        """Test that only functions decorated with cache=True are cached."""
+        calls = []
+
+        @similarities.validate_input()
+        def func(*args) -> int:
+            calls.append(args)
+            return len(calls)
+        assert func(SET_0_10, SET_10_15) == 1
+        assert func(SET_0_10, SET_10_15) == 2
+
+    def test_disabled(self) -> None:
+        """Test that nothing is cached once the cache is turned off."""
+        set_a, set_b = frozenset(range(10)), frozenset(range(5, 15))
+        similarities.overlap_coefficient(set_a, set_b)
+        similarities.enable_cache(False)
+        assert similarities._cached_call.cache_info().currsize == 0
+        similarities.overlap_coefficient(set_a, set_b)
+        assert similarities._cached_call.cache_info().currsize == 0
+
+    def test_sets_not_cached(self) -> None:
+        """Test that mutable sets bypass the cache."""
+        similarities.clear_cache()
+        similarities.overlap_coefficient(set(range(10)), set(range(5, 15)))
+        assert similarities._cached_call.cache_info().currsize == 0
+
+
+class TestComputeAll:
+
+    def test_matches_coefficients(self) -> None:
+        """Test that every coefficient matches its separate function."""
+        set_a = {1, 2, 3}
+        set_b = {3, 4}
+        for args in [(set_a, set_b), (set_a, set_b, set(range(1, 7)))]:
+            result = similarities.compute_all(*args)
+            assert result == similarities.Coefficients(
+                overlap=similarities.overlap_coefficient(*args),
+                jaccard=similarities.jaccard_similarity(*args),
+                dice=similarities.dice_sørensen_coefficient(*args),
+                cosine=similarities.cosine_similarity(*args),
+                simple_matching=similarities.simple_matching_coefficient(
+                    *args),
+                hamming=similarities.hamming_coefficient(*args))
+
+    def test_empty_set(self) -> None:
+        """Test that an empty set is rejected like the overlap coefficient."""
+        result = _expect_warn("At least one of the sets must be non-empty.",
+                              similarities.compute_all, {1}, set())
+        assert result is None
+
+    def test_result_type(self) -> None:
+        """Test that the result is a plain, picklable Coefficients tuple."""
+        result = similarities.compute_all({1, 2, 3}, {3, 4})
+        assert isinstance(result, similarities.Coefficients)
+        assert pickle.loads(pickle.dumps(result)) == result
+
+
+class TestCosineCdist:
+
+    def test_matches_cosine_similarity(self) -> None:
+        """Test that every entry matches the pairwise cosine similarity."""
+        sets = [set("the best data science course".split(" ")),
+                set("data science is popular".split(" ")),
+                {"data"}]
+        matrix = similarities.cosine_cdist(sets)
+        for i, set_a in enumerate(sets):
+            for j, set_b in enumerate(sets):
+                assert matrix[i][j] == pytest.approx(
+                    similarities.cosine_similarity(set_a, set_b))
+
+    def test_empty_sets(self) -> None:
+        """Test that pairs with an empty set give a similarity of zero."""
+        assert similarities.cosine_cdist([{1}, set()]) == [[1, 0], [0, 0]]
+
+    def test_exact_diagonal(self) -> None:
+        """Test that equal sets give exactly 1 for sizes whose inverse norms
+        do not multiply back to 1."""
+        sets = [set(range(size)) for size in [2, 3, 6, 7]]
+        matrix = similarities.cosine_cdist(sets)
+        assert [matrix[i][i] for i in range(len(sets))] == [1.0] * 4
+        assert similarities.pairwise(similarities.cosine_similarity,
+                                     [{1, 2, 3}],
+                                     [{1, 2, 3}]) == [[1.0]]
+
+
+class TestAllPairs:
+
+    sets = [{2, 3, 4, 5}, {1, 3, 4, 5}, {1}, set()]
+
+    @pytest.mark.parametrize("metric, method", [
+        ("overlap", similarities.overlap_coefficient),
+        ("jaccard", similarities.jaccard_similarity),
+        ("dice", similarities.dice_sørensen_coefficient),
+        ("cosine", similarities.cosine_similarity)])
+    def test_matches_coefficients(self,
+                                  metric: str,
+                                  method: typing.Callable) -> None:
+        """Test that non-empty pairs match the pairwise coefficient."""
+        matrix = similarities.all_pairs(self.sets, metric)
+        for i, set_a in enumerate(self.sets[:3]):
+            for j, set_b in enumerate(self.sets[:3]):
+                assert matrix[i][j] == pytest.approx(method(set_a, set_b))
+        assert matrix[3] == [0, 0, 0, 0]
+
+    def test_invalid_input(self) -> None:
+        """Test that every set is validated before the pairs are scored."""
+        with pytest.raises(TypeError,
+                           match="All arguments must be sets!"):
+            similarities.all_pairs([{1}, [2]])
+        with pytest.raises(
+                TypeError,
+                match="Elements in the sets must be of the same type."):
+            similarities.all_pairs([{1}, set(), {"f"}])
+        assert similarities.all_pairs([{1}, {.5}]) == [[1, 0], [0, 1]]
+
+    def test_on_empty(self) -> None:
+        """Test the handling of empty sets in a batch."""
+        sets = [{1}, set(), set()]
+        expected = [[1, 0, 0], [0, 0, 0], [0, 0, 0]]
+        assert similarities.all_pairs(sets) == expected
+        result = _expect_warn("At least one of the sets is empty!",
+                              similarities.all_pairs,
+                              sets,
+                              on_empty="warn")
+        assert result == expected
+        with pytest.raises(ValueError,
+                           match="At least one of the sets is empty!"):
+            similarities.all_pairs(sets, on_empty="raise")
+        with pytest.raises(ValueError,
+                           match="The provided on_empty is incorrect"):
+            similarities.all_pairs(sets, on_empty="ignore")
+
+    def test_invalid_metric(self) -> None:
+        """Test for an unsupported metric."""
+        with pytest.raises(ValueError,
+                           match="The provided metric is incorrect"):
+            similarities.all_pairs(self.sets, "hamming")
+
+
+class TestPairwise:
+
+    @pytest.mark.parametrize("method", [
+        similarities.overlap_coefficient,
+        similarities.jaccard_similarity,
+        similarities.dice_sørensen_coefficient,
+        similarities.cosine_similarity,
+        ])
+    def test_matches_coefficients(self, method: typing.Callable) -> None:
+        """Test that every entry matches the pairwise coefficient."""
+        sets_a = [{2, 3, 4, 5}, {7}, {1, 3}]
+        sets_b = [{1, 3, 4, 5}, {3}]
+        matrix = similarities.pairwise(method, sets_a, sets_b)
+        assert len(matrix) == 3
+        for row, set_a in zip(matrix, sets_a):
+            assert row == pytest.approx([method(set_a, set_b)
+                                         for set_b in sets_b])
+
+    @pytest.mark.parametrize("method, set_a, set_b", [
+        (similarities.jaccard_similarity, JAC_A1, JAC_B1),
+        (similarities.dice_sørensen_coefficient, DICE_A, DICE_B),
+        (similarities.cosine_similarity, COS_A, COS_B),
+        ])
+    def test_examples(self,
+                      method: typing.Callable,
+                      set_a: frozenset,
+                      set_b: frozenset) -> None:
+        """Test that a single pair matches the scalar coefficient."""
+        matrix = similarities.pairwise(method, [set_a], [set_b])
+        assert matrix[0][0] == pytest.approx(method(set_a, set_b))
+
+    def test_invalid_input(self) -> None:
+        """Test that both collections are validated."""
+        with pytest.raises(
+                TypeError,
+                match="Elements in the sets must be of the same type."):
+            similarities.pairwise(similarities.jaccard_similarity,
+                                  [{1}],
+                                  [{"f"}])
+
+    def test_generators(self) -> None:
+        """Test that generators of sets are consumed only once."""
+        matrix = similarities.pairwise(similarities.jaccard_similarity,
+                                       (s for s in [{1}, {1, 2}]),
+                                       (s for s in [{2}]))
+        assert matrix == [[0.0], [0.5]]
+        assert similarities.all_pairs(s for s in [{1}, {1, 2}]) ==\
+            [[1.0, 0.5], [0.5, 1.0]]
+
+    def test_invalid_method(self) -> None:
+        """Test for a method without a batched implementation."""
+        with pytest.raises(ValueError,
+                           match="The provided method is incorrect"):
+            similarities.pairwise(similarities.hamming_coefficient,
+                                  [{1}],
+                                  [{2}])
+
+
+class TestShortcuts:
+
+    @pytest.mark.parametrize("method, identical, disjoint", [
+        (similarities.overlap_coefficient, 1, 0),
+        (similarities.jaccard_similarity, 1, 0),
+        (similarities.dice_sørensen_coefficient, 1, 0),
+        (similarities.cosine_similarity, 1, 0),
+        (similarities.simple_matching_coefficient, 1, 0),
+        (similarities.hamming_coefficient, 0, 1)])
+    def test_identical_and_disjoint(self,
+                                    method: typing.Callable,
+                                    identical: float,
+                                    disjoint: float) -> None:
+        """Test the identical and disjoint shortcuts."""
+        set_a = set(range(10))
+        assert method(set_a, set_a) == identical
+        assert method(set_a, set(range(10, 20))) == disjoint
+
+
+class TestTopKJaccard:
+
+    def test_matches_all_pairs(self) -> None:
+        """Test that the top pairs match the full Jaccard matrix."""
+        sets = [JAC_A1, JAC_B1, {2, 3, 4, 5}, {1, 3, 4, 5}, {10, 11},
+                set()]
+        matrix = similarities.all_pairs(sets, "jaccard")
+        result = similarities.top_k_jaccard(sets, 2)
+        for index, top in enumerate(result):
+            expected = sorted(((other, score)
+                               for other, score in enumerate(matrix[index])
+                               if other != index and score > 0),
+                              key=lambda pair: (-pair[1], pair[0]))[:2]
+            assert top == expected
+        assert result[4] == result[5] == []
+
+    def test_generator(self) -> None:
+        """Test that a generator of sets is consumed only once."""
+        sets = [{1, 2}, {1, 2}, {2}]
+        assert similarities.top_k_jaccard((s for s in sets), 1) ==\
+            similarities.top_k_jaccard(tuple(sets), 1) ==\
+            [[(1, 1.0)], [(0, 1.0)], [(0, 0.5)]]
+
+    def test_invalid_k(self) -> None:
+        """Test for a k smaller than 1."""
+        with pytest.raises(ValueError,
+                           match="The provided k is incorrect"):
+            similarities.top_k_jaccard([{1}, {1}], 0)
+
+
+class TestIntervals:
+
+    @pytest.mark.parametrize("interval_method, method", [
+        (similarities.overlap_interval, similarities.overlap_coefficient),
+        (similarities.jaccard_interval, similarities.jaccard_similarity),
+        (similarities.dice_interval, similarities.dice_sørensen_coefficient),
+        ])
+    def test_matches_coefficient(self,
+                                 interval_method: typing.Callable,
+                                 method: typing.Callable) -> None:
+        """Test that intervals match the sets of their integers."""
+        for interval1, interval2 in [((0, 10), (10, 15)), ((0, 10), (0, 10)),
+                                     ((0, 10), (5, 20)), ((3, 4), (0, 10))]:
+            assert interval_method(interval1, interval2) ==\
+                method(set(range(*interval1)), set(range(*interval2)))
+
+    def test_empty_intervals(self) -> None:
+        """Test that empty intervals give a coefficient of zero."""
+        assert similarities.jaccard_interval((0, 0), (5, 5)) == 0
+        assert similarities.jaccard_interval(range(5, 0), range(3, 3)) == 0
+        assert similarities.overlap_interval((0, 0), (0, 5)) == 0
+        assert similarities.dice_interval((0, 0), (5, 5)) == 0
+        # Reversed bounds are empty intervals as well
+        for interval_method in [similarities.overlap_interval,
+                                similarities.jaccard_interval,
+                                similarities.dice_interval]:
+            for result in [interval_method((5, 2), (0, 10)),
+                           interval_method((5, 2), (5, 2))]:
+                # A positive zero, as a negative size would give -0.0
+                assert result == 0 and math.copysign(1, result) == 1
+
+    def test_ranges(self) -> None:
+        """Test that ranges give the same result as their bounds."""
+        assert similarities.jaccard_interval(range(10), range(5, 20)) ==\
+            similarities.jaccard_interval((0, 10), (5, 20))
+        assert similarities.jaccard_interval(range(10), (10, 15)) == 0
+        with pytest.raises(ValueError,
+                           match="The provided range is incorrect"):
+            similarities.jaccard_interval(range(0, 10, 2), range(10))
+
+    def test_list_bounds(self) -> None:
+        """Test that bounds given as lists are unpacked like tuples."""
+        for interval_method in [similarities.overlap_interval,
+                                similarities.jaccard_interval,
+                                similarities.dice_interval]:
+            assert interval_method([0, 3], [1, 2]) ==\
+                interval_method((0, 3), (1, 2))
+
+
 if __name__ == "__main__":
     pass